@@ -4,134 +4,153 @@ AI-Powered Content-Based Categorization System
 Uses AI to intelligently categorize files based on their content
 """
 
+import os
 import re
+import sys
+import atexit
+import shelve
+import hashlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
-# Optional torch import for AI functionality
+from file_type_config import FileCategory
+
+# Optional torch and outlines (schema-constrained generation) for AI
+# categorization. Both are only looked up here and imported where they are
+# used, so importing this module stays cheap when no model is loaded
+TORCH_AVAILABLE = importlib.util.find_spec('torch') is not None
+OUTLINES_AVAILABLE = importlib.util.find_spec('outlines') is not None
+
+# Optional blake3 import for faster content hashing
 try:
-    import torch
-    TORCH_AVAILABLE = True
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
 except ImportError:
-    TORCH_AVAILABLE = False
+    BLAKE3_AVAILABLE = False
+
+# Shape of a categorization response; constrained decoding can only emit text matching it
+RESPONSE_SCHEMA_REGEX = (
+    r"CATEGORY: [A-Za-z ]{1,30}/[A-Za-z ]{1,30}\n"
+    r"REASON: [^\n]{1,200}\n"
+    r"TAGS: [^\n]{1,100}\n"
+    r"CONFIDENCE: (0\.[0-9]|1\.0)"
+)
+
+# Compact category tree embedded in every prompt; the model attends to it on each decode step
+SHORT_CATEGORY_MAP = """Code: Python, JavaScript, Web, Database, Configuration, Other
+Documents: Technical, Business, Academic, Personal, Legal, Creative
+Data: Financial, Scientific, User, Analytics, Database
+Images: Personal Photos, Professional, Graphics, Screenshots, Art
+Media: Audio, Video, Entertainment
+Archives: Software, Documents, Media, Backups
+Applications: Windows, macOS, Linux, Mobile
+System: Configuration, Logs, Temporary, Security"""
+
+# Number of content characters included in the prompt
+CONTENT_PREVIEW_CHARS = 300
+
+# Content shorter than this (after stripping) is categorized by extension alone
+MIN_CONTENT_CHARS = 32
+
+# Opt-in on-disk cache of AI categorization results (category, tags and
+# confidence only), keyed by prompt/model version, extension and content hash
+RESULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'local-file-organizer', 'ai_categorization')
+RESULT_CACHE_HASHED_CHARS = 4096
 
 class AICategorizer:
     """AI-powered categorizer that determines file categories based on content"""
     
     def __init__(self):
         # Define the main category structure for AI to use
-        self.category_structure = """
-        Main Categories:
-        1. Code/
-           - Python/ (Python scripts, modules, packages)
-           - JavaScript/ (JS files, Node.js, web scripts)
-           - Web/ (HTML, CSS, web frameworks)
-           - Database/ (SQL, NoSQL, schemas)
-           - Configuration/ (config files, settings)
-           - Other/ (other programming languages)
-        
-        2. Documents/
-           - Technical/ (API docs, technical specs, manuals)
-           - Business/ (reports, plans, contracts, financial)
-           - Academic/ (research papers, theses, studies)
-           - Personal/ (notes, diaries, personal docs)
-           - Legal/ (legal documents, contracts, policies)
-           - Creative/ (stories, scripts, creative writing)
-        
-        3. Data/
-           - Financial/ (budgets, invoices, financial reports)
-           - Scientific/ (research data, experiments, analysis)
-           - User/ (user data, profiles, preferences)
-           - Analytics/ (business intelligence, metrics, KPIs)
-           - Database/ (data exports, backups, dumps)
-        
-        4. Images/
-           - Personal Photos/ (family, friends, personal)
-           - Professional/ (work-related, business)
-           - Graphics/ (designs, logos, illustrations)
-           - Screenshots/ (system, application, web)
-           - Art/ (creative, artistic, drawings)
-        
-        5. Media/
-           - Audio/ (music, podcasts, voice recordings)
-           - Video/ (movies, tutorials, presentations)
-           - Entertainment/ (games, entertainment content)
-        
-        6. Archives/
-           - Software/ (installers, packages)
-           - Documents/ (document collections)
-           - Media/ (media collections)
-           - Backups/ (system backups, data backups)
-        
-        7. Applications/
-           - Windows/ (Windows executables)
-           - macOS/ (macOS applications)
-           - Linux/ (Linux applications)
-           - Mobile/ (mobile apps, APKs)
-        
-        8. System/
-           - Configuration/ (system configs)
-           - Logs/ (system logs, application logs)
-           - Temporary/ (temp files, cache)
-           - Security/ (certificates, keys)
-        """
-    
-    def create_ai_prompt(self, content: str, file_path: str, ai_description: str) -> str:
-        """Create an AI prompt for intelligent categorization"""
-        
-        prompt = f"""
-        Analyze this file and categorize it intelligently based on its content.
+        self.category_structure = SHORT_CATEGORY_MAP
         
-        File Path: {file_path}
-        AI Description: {ai_description}
+        # The response is a short fixed 4-line schema, so decode greedily and
+        # bound the number of new tokens rather than the total sequence length
+        self.generation_kwargs = {
+            'max_new_tokens': 80,
+            'do_sample': False,
+            'num_beams': 1,
+            'use_cache': True,
+        }
         
-        {self.category_structure}
+        # Matches the "FIELD: value" lines of a categorization response
+        self._response_re = re.compile(r'^[ \t]*(CATEGORY|REASON|TAGS|CONFIDENCE):(.*)$', re.MULTILINE)
         
-        Instructions:
-        1. Analyze the content and AI description carefully
-        2. Choose the most appropriate category and subcategory
-        3. Provide a detailed explanation of why this category was chosen
-        4. Suggest additional tags or metadata if relevant
-        5. Return the result in this exact format:
+        # Phrases that decide the category without asking the model, when the
+        # AI description opens with them ("A Python script that ..."); a phrase
+        # later on may just be quoted from the file and decides nothing
+        fast_rules = [
+            (r'python (?:script|module|package|code)\b', "Code/Python"),
+            (r'(?:javascript|node\.js|typescript)\b', "Code/JavaScript"),
+            (r'(?:html (?:page|document)|css stylesheet|web page)\b', "Code/Web"),
+            (r'sql (?:query|script|schema|dump)\b', "Code/Database"),
+            (r'(?:config(?:uration)? file|settings file)\b', "Code/Configuration"),
+            (r'(?:invoice|receipt|budget)s?\b', "Data/Financial"),
+            (r'(?:research paper|thesis|dissertation)\b', "Documents/Academic"),
+            (r'(?:contract|privacy policy|terms of service|non-disclosure agreement)\b', "Documents/Legal"),
+            (r'(?:business plan|meeting minutes|quarterly report)\b', "Documents/Business"),
+            (r'log file\b', "System/Logs"),
+        ]
+        lead = r'\s*(?:(?:this|it) is )?(?:an? |the )?'
+        self._fast_rules: List[Tuple[re.Pattern, str]] = [
+            (re.compile(f'{lead}({pattern})', re.IGNORECASE), category) for pattern, category in fast_rules
+        ]
+        # All phrases in one alternation, so descriptions opening with none of
+        # them (the common case) are rejected in a single match
+        self._fast_rules_any = re.compile(
+            lead + '(?:' + '|'.join(pattern for pattern, _ in fast_rules) + ')', re.IGNORECASE
+        )
         
-        CATEGORY: [Main Category]/[Subcategory]
-        REASON: [Detailed explanation]
-        TAGS: [comma-separated tags]
-        CONFIDENCE: [0.0-1.0]
+        # Schema-constrained generator, built lazily for the model it wraps
+        self._constrained_generator = None
+        self._constrained_model = None
         
-        File Content Preview:
-        {content[:1000]}...
+        # Token ids of the static prompt prefix, encoded once per tokenizer
+        self._prefix_ids = None
+        self._prefix_tokenizer = None
         
-        Please analyze and categorize this file:
-        """
-        
-        return prompt
+        # Prebuild the prompt once; only the per-file fields are substituted later.
+        # The static instructions come first so every prompt shares the same prefix.
+        self._prompt_prefix = f"""Categorize the file below by its content. Categories (Main: Subcategories):
+{self.category_structure}
+Reply in exactly this format:
+CATEGORY: Main/Subcategory
+REASON: short explanation
+TAGS: comma-separated tags
+CONFIDENCE: 0.0-1.0
+
+"""
+        self._prompt_tail_template = """File Path: {file_path}
+AI Description: {ai_description}
+Content Preview:
+{content_preview}...
+
+"""
+    
+    def create_ai_prompt(self, content: str, file_path: str, ai_description: str) -> str:
+        """Create an AI prompt for intelligent categorization"""
+        return self._prompt_prefix + self._prompt_tail_template.format_map({
+            'file_path': file_path,
+            'ai_description': ai_description,
+            'content_preview': content[:CONTENT_PREVIEW_CHARS],
+        })
     
     def parse_ai_response(self, ai_response: str) -> Tuple[str, str, List[str], float]:
         """Parse the AI response to extract categorization information"""
         
         try:
-            lines = ai_response.strip().split('\n')
-            category = "Other"
-            reason = "AI analysis provided"
-            tags = []
-            confidence = 0.7
+            # One regex pass collects every field line; later lines win, as before
+            fields = {key: value.strip() for key, value in self._response_re.findall(ai_response)}
             
-            for line in lines:
-                line = line.strip()
-                if line.startswith('CATEGORY:'):
-                    category = line.replace('CATEGORY:', '').strip()
-                elif line.startswith('REASON:'):
-                    reason = line.replace('REASON:', '').strip()
-                elif line.startswith('TAGS:'):
-                    tags_str = line.replace('TAGS:', '').strip()
-                    tags = [tag.strip() for tag in tags_str.split(',') if tag.strip()]
-                elif line.startswith('CONFIDENCE:'):
-                    conf_str = line.replace('CONFIDENCE:', '').strip()
-                    try:
-                        confidence = float(conf_str)
-                    except ValueError:
-                        confidence = 0.7
+            category = fields.get('CATEGORY', "Other")
+            reason = fields.get('REASON', "AI analysis provided")
+            tags = [tag.strip() for tag in fields.get('TAGS', '').split(',') if tag.strip()]
+            try:
+                confidence = float(fields['CONFIDENCE'])
+            except (KeyError, ValueError):
+                confidence = 0.7
             
             return category, reason, tags, confidence
             
@@ -139,6 +158,22 @@ class AICategorizer:
             # Fallback if AI response parsing fails
             return "Other", f"AI analysis failed: {str(e)}", [], 0.5
     
+    def fast_categorize(self, ai_description: str) -> Optional[Tuple[str, str, List[str], float]]:
+        """Categorize from a decisive phrase opening the AI description, or return None if there is none"""
+        
+        if not self._fast_rules_any.match(ai_description):
+            return None
+        
+        # Rules are checked in order, so the first listed phrase still wins
+        for pattern, category in self._fast_rules:
+            match = pattern.match(ai_description)
+            if match:
+                phrase = match.group(1)
+                reason = f"Description starts with '{phrase}'"
+                return category, f"{ai_description} | {reason}", [phrase.lower()], 0.9
+        
+        return None
+    
     def categorize_with_ai(self, 
                           file_path: str, 
                           content: str, 
@@ -155,6 +190,11 @@ class AICategorizer:
             - confidence: AI confidence level
         """
         
+        # Skip the model entirely when the description already settles the category
+        fast_result = self.fast_categorize(ai_description)
+        if fast_result is not None:
+            return fast_result
+        
         try:
             # Create AI prompt for categorization
             prompt = self.create_ai_prompt(content, file_path, ai_description)
@@ -175,6 +215,98 @@ class AICategorizer:
             # This ensures we don't lose the original category when AI fails
             return "EXTENSION_BASED", f"{ai_description} (AI categorization failed: {str(e)})", [], 0.5
     
+    def categorize_batch_with_ai(self,
+                                 files: List[Tuple[str, str, str]],
+                                 text_model,
+                                 text_tokenizer,
+                                 batch_size: int = 16) -> List[Tuple[str, str, List[str], float]]:
+        """
+        Use AI to categorize several files with batched generation
+        
+        Args:
+            files: (file_path, content, ai_description) tuples
+        
+        Returns one (category, description, tags, confidence) tuple per file,
+        in the same order as the input.
+        """
+        
+        results = [self.fast_categorize(ai_description) for _, _, ai_description in files]
+        
+        # Only files without a decisive description go to the model
+        pending = [i for i, result in enumerate(results) if result is None]
+        prompts = [self.create_ai_prompt(files[i][1], files[i][0], files[i][2]) for i in pending]
+        ai_responses = self._get_ai_categorization_batch(prompts, text_model, text_tokenizer, batch_size)
+        
+        for i, ai_response in zip(pending, ai_responses):
+            category, reason, tags, confidence = self.parse_ai_response(ai_response)
+            results[i] = (category, f"{files[i][2]} | {reason}", tags, confidence)
+        
+        return results
+    
+    def _get_constrained_generator(self, text_model, text_tokenizer):
+        """Get a generator that can only produce RESPONSE_SCHEMA_REGEX, or None if unavailable"""
+        
+        if not OUTLINES_AVAILABLE:
+            return None
+        
+        if self._constrained_model is not text_model:
+            try:
+                import outlines
+                model = outlines.models.Transformers(text_model, text_tokenizer)
+                self._constrained_generator = outlines.generate.regex(model, RESPONSE_SCHEMA_REGEX)
+            except Exception:
+                self._constrained_generator = None
+            self._constrained_model = text_model
+        
+        return self._constrained_generator
+    
+    def _load_prefix(self, text_tokenizer) -> bool:
+        """Encode the static prompt prefix once per tokenizer"""
+        
+        if self._prefix_tokenizer is not text_tokenizer:
+            try:
+                self._prefix_ids = text_tokenizer.encode(self._prompt_prefix)
+            except Exception:
+                # Encode whole prompts instead
+                self._prefix_ids = None
+            self._prefix_tokenizer = text_tokenizer
+        
+        return self._prefix_ids is not None
+    
+    def _max_prompt_tokens(self, text_model, text_tokenizer) -> int:
+        """Get the longest prompt that leaves room for max_new_tokens in the model's context"""
+        
+        config = getattr(text_model, 'config', None)
+        context = getattr(config, 'n_positions', None) or getattr(config, 'max_position_embeddings', None)
+        if not context:
+            # Tokenizers without a known limit report a huge sentinel value
+            model_max_length = getattr(text_tokenizer, 'model_max_length', None)
+            context = model_max_length if model_max_length and model_max_length < 100000 else 1024
+        return max(context - self.generation_kwargs['max_new_tokens'], 1)
+    
+    def _encode_prompts(self, prompts: List[str], text_tokenizer, max_length: int):
+        """Encode prompts as one left-padded batch of at most max_length tokens, reusing the encoded prefix when they all share it"""
+        
+        if text_tokenizer.pad_token is None:
+            text_tokenizer.pad_token = text_tokenizer.eos_token
+        
+        if (all(prompt.startswith(self._prompt_prefix) for prompt in prompts)
+                and self._load_prefix(text_tokenizer) and len(self._prefix_ids) < max_length):
+            # Only the per-file tails need tokenizing; the prefix ids are reused
+            tails = text_tokenizer(
+                [prompt[len(self._prompt_prefix):] for prompt in prompts],
+                add_special_tokens=False,
+                truncation=True,
+                max_length=max_length - len(self._prefix_ids)
+            )['input_ids']
+            return text_tokenizer.pad(
+                {'input_ids': [self._prefix_ids + tail for tail in tails]},
+                padding=True,
+                return_tensors="pt"
+            )
+        
+        return text_tokenizer(prompts, return_tensors="pt", padding=True, truncation=True, max_length=max_length)
+    
     def _get_ai_categorization(self, prompt: str, text_model, text_tokenizer) -> str:
         """Get AI response for categorization"""
         
@@ -186,24 +318,33 @@ class AICategorizer:
             CONFIDENCE: 0.0
             """
         
+        generator = self._get_constrained_generator(text_model, text_tokenizer)
+        if generator is not None:
+            try:
+                return generator(prompt, max_tokens=self.generation_kwargs['max_new_tokens'])
+            except Exception:
+                pass  # Fall back to unconstrained generation
+        
+        import torch
+        
         try:
-            # Encode the prompt
-            inputs = text_tokenizer.encode(prompt, return_tensors="pt", truncation=True, max_length=1000)
+            # Encode the prompt, only tokenizing its per-file tail
+            inputs = self._encode_prompts(
+                [prompt], text_tokenizer, self._max_prompt_tokens(text_model, text_tokenizer)
+            ).to(text_model.device)
             
             # Generate response
-            with torch.no_grad():
+            with torch.inference_mode():
                 outputs = text_model.generate(
-                    inputs,
-                    max_length=500,
-                    num_return_sequences=1,
-                    temperature=0.3,  # Lower temperature for more focused responses
-                    do_sample=True,
-                    pad_token_id=text_tokenizer.eos_token_id
+                    **inputs,
+                    pad_token_id=text_tokenizer.pad_token_id,
+                    **self.generation_kwargs
                 )
             
-            response = text_tokenizer.decode(outputs[0], skip_special_tokens=True)
+            # Only decode the generated tokens, not the echoed prompt
+            response = text_tokenizer.decode(outputs[0, inputs['input_ids'].shape[1]:], skip_special_tokens=True)
             
-            # Extract only the response part (remove the prompt)
+            # Extract only the response part (drop any preamble)
             if 'CATEGORY:' in response:
                 response_parts = response.split('CATEGORY:')
                 if len(response_parts) > 1:
@@ -220,15 +361,159 @@ class AICategorizer:
             CONFIDENCE: 0.5
             """
 
+    def _get_ai_categorization_batch(self,
+                                     prompts: List[str],
+                                     text_model,
+                                     text_tokenizer,
+                                     batch_size: int = 16) -> List[str]:
+        """Get AI responses for several prompts, generating them in padded batches"""
+        
+        if not prompts:
+            return []
+        
+        if not TORCH_AVAILABLE:
+            return [self._get_ai_categorization(prompt, text_model, text_tokenizer) for prompt in prompts]
+        
+        import torch
+        
+        # Group prompts of similar length together to minimize padding waste
+        order = sorted(range(len(prompts)), key=lambda i: len(prompts[i]))
+        batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+        
+        generator = self._get_constrained_generator(text_model, text_tokenizer)
+        if generator is not None:
+            try:
+                responses = [''] * len(prompts)
+                for indices in batches:
+                    generated = generator([prompts[i] for i in indices],
+                                          max_tokens=self.generation_kwargs['max_new_tokens'])
+                    for i, response in zip(indices, generated):
+                        responses[i] = response
+                return responses
+            except Exception:
+                pass  # Fall back to unconstrained generation
+        
+        try:
+            # Decoder-only models must be padded on the left for batched generation
+            if text_tokenizer.pad_token is None:
+                text_tokenizer.pad_token = text_tokenizer.eos_token
+            text_tokenizer.padding_side = 'left'
+            
+            responses = [''] * len(prompts)
+            
+            # Prompts plus generated tokens must fit in the model's position embeddings
+            max_prompt_tokens = self._max_prompt_tokens(text_model, text_tokenizer)
+            
+            def encode(indices):
+                return self._encode_prompts([prompts[i] for i in indices], text_tokenizer, max_prompt_tokens)
+            
+            def decode(indices, generated):
+                decoded = text_tokenizer.batch_decode(generated, skip_special_tokens=True)
+                for i, response in zip(indices, decoded):
+                    responses[i] = response
+            
+            # Tokenizer work runs on one helper thread (the tokenizer is not safe to
+            # share across threads), overlapping with generate() on this thread:
+            # the next batch is encoded and the previous one decoded meanwhile.
+            with ThreadPoolExecutor(max_workers=1) as tokenizer_thread:
+                next_inputs = tokenizer_thread.submit(encode, batches[0])
+                decodes = []
+                failed = []
+                
+                for k, indices in enumerate(batches):
+                    pending_inputs = next_inputs
+                    if k + 1 < len(batches):
+                        next_inputs = tokenizer_thread.submit(encode, batches[k + 1])
+                    
+                    try:
+                        inputs = pending_inputs.result().to(text_model.device)
+                        with torch.inference_mode():
+                            outputs = text_model.generate(
+                                **inputs,
+                                pad_token_id=text_tokenizer.pad_token_id,
+                                **self.generation_kwargs
+                            )
+                        
+                        # Only decode the generated tokens, not the echoed prompt
+                        generated = outputs[:, inputs['input_ids'].shape[1]:].cpu()
+                        decodes.append((indices, tokenizer_thread.submit(decode, indices, generated)))
+                    except Exception as e:
+                        failed.append((indices, e))
+                
+                for indices, pending_decode in decodes:
+                    try:
+                        pending_decode.result()
+                    except Exception as e:
+                        failed.append((indices, e))
+            
+            # One bad batch should not cost the others; retry its files one at a time
+            for indices, error in failed:
+                print(f"Batched categorization failed, retrying file by file: {error}", file=sys.stderr)
+                for i in indices:
+                    responses[i] = self._get_ai_categorization(prompts[i], text_model, text_tokenizer)
+            
+            return responses
+            
+        except Exception as e:
+            # Fallback response if AI generation fails
+            return [f"""
+            CATEGORY: EXTENSION_BASED
+            REASON: AI analysis failed due to technical error: {str(e)}
+            TAGS: error, ai-failed
+            CONFIDENCE: 0.5
+            """] * len(prompts)
+
+# Shared categorizer instance; the prompt template is built once per process
+_CATEGORIZER = AICategorizer()
+
+_result_cache = None
+
+def _get_result_cache():
+    """Open the on-disk result cache on first use, falling back to memory if it can't be opened"""
+    global _result_cache
+    if _result_cache is None:
+        try:
+            os.makedirs(os.path.dirname(RESULT_CACHE_PATH), exist_ok=True)
+            _result_cache = shelve.open(RESULT_CACHE_PATH)
+            atexit.register(_result_cache.close)
+        except Exception:
+            _result_cache = {}
+    return _result_cache
+
+def _result_cache_salt(text_model) -> bytes:
+    """Identify the prompt, model and quantization that cached results were produced with"""
+    return '\0'.join([
+        _CATEGORIZER._prompt_prefix,
+        _CATEGORIZER._prompt_tail_template,
+        repr(sorted(_CATEGORIZER.generation_kwargs.items())),
+        str(getattr(text_model, 'name_or_path', type(text_model).__name__)),
+        str(getattr(text_model, 'is_loaded_in_8bit', False)),
+    ]).encode('utf-8', errors='replace')
+
+def _result_cache_key(salt: bytes, file_path: str, content: str) -> str:
+    """Build the result cache key from the version salt, file extension and the start of its content"""
+    extension = os.path.splitext(file_path)[1].lower()
+    data = salt + b'\0' + extension.encode() + b'\0' + content[:RESULT_CACHE_HASHED_CHARS].encode('utf-8', errors='replace')
+    if BLAKE3_AVAILABLE:
+        return blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _is_trivial_content(content: str, extension_category: str) -> bool:
+    """Check whether content is too short to be worth categorizing beyond its extension"""
+    return extension_category != FileCategory.OTHER.value and len(content.strip()) < MIN_CONTENT_CHARS
+
 def categorize_by_content(file_path: str, 
                          content: str, 
                          ai_description: str,
                          extension_category: str,
                          text_model,
-                         text_tokenizer) -> Tuple[str, str, List[str], float]:
+                         text_tokenizer,
+                         use_cache: bool = False) -> Tuple[str, str, List[str], float]:
     """
     AI-powered file categorization based on content
     
+    With use_cache, results for content seen in earlier runs are reused.
+    
     Returns:
         - final_category: AI-determined category
         - description: Enhanced description with AI reasoning
@@ -236,10 +521,21 @@ def categorize_by_content(file_path: str,
         - confidence: AI confidence level
     """
     
-    categorizer = AICategorizer()
+    # Near-empty files carry no content signal; trust the extension and skip the model
+    if _is_trivial_content(content, extension_category):
+        return extension_category, ai_description, [], 0.6
+    
+    # Identical content seen before (in this or an earlier run) reuses its result
+    if use_cache:
+        cache = _get_result_cache()
+        cache_key = _result_cache_key(_result_cache_salt(text_model), file_path, content)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            category, tags, confidence = cached
+            return category, ai_description, tags, confidence
     
     # Use AI for categorization
-    category, description, tags, confidence = categorizer.categorize_with_ai(
+    category, description, tags, confidence = _CATEGORIZER.categorize_with_ai(
         file_path, content, ai_description, text_model, text_tokenizer
     )
     
@@ -247,8 +543,65 @@ def categorize_by_content(file_path: str,
     if category == "EXTENSION_BASED":
         return extension_category, description, tags, confidence
     
+    if use_cache:
+        cache[cache_key] = (category, tags, confidence)
     return category, description, tags, confidence
 
+def categorize_by_content_batch(files: List[Tuple[str, str, str, str]],
+                                text_model,
+                                text_tokenizer,
+                                batch_size: int = 16,
+                                use_cache: bool = False) -> List[Tuple[str, str, List[str], float]]:
+    """
+    Batched variant of categorize_by_content
+    
+    Args:
+        files: (file_path, content, ai_description, extension_category) tuples
+        use_cache: reuse results for content seen in earlier runs
+    
+    Returns one (final_category, description, tags, confidence) tuple per file,
+    in the same order as the input.
+    """
+    
+    if not files:
+        return []
+    
+    # Near-empty files carry no content signal; trust the extension and skip the model
+    results = [
+        (extension_category, ai_description, [], 0.6) if _is_trivial_content(content, extension_category) else None
+        for _, content, ai_description, extension_category in files
+    ]
+    
+    # Identical content seen before (in this or an earlier run) reuses its result
+    if use_cache:
+        cache = _get_result_cache()
+        salt = _result_cache_salt(text_model)
+        cache_keys = [None if result else _result_cache_key(salt, file_path, content)
+                      for (file_path, content, _, _), result in zip(files, results)]
+        for i, cache_key in enumerate(cache_keys):
+            cached = cache.get(cache_key) if cache_key is not None else None
+            if cached is not None:
+                category, tags, confidence = cached
+                results[i] = (category, files[i][2], tags, confidence)
+    
+    pending = [i for i, result in enumerate(results) if result is None]
+    
+    ai_results = _CATEGORIZER.categorize_batch_with_ai(
+        [files[i][:3] for i in pending],
+        text_model, text_tokenizer, batch_size
+    )
+    
+    for i, (category, description, tags, confidence) in zip(pending, ai_results):
+        if category == "EXTENSION_BASED":
+            # If AI categorization failed, fall back to extension-based category
+            results[i] = (files[i][3], description, tags, confidence)
+        else:
+            results[i] = (category, description, tags, confidence)
+            if use_cache:
+                cache[cache_keys[i]] = (category, tags, confidence)
+    
+    return results
+
 # Example usage
 if __name__ == "__main__":
     print("AI-Powered Content Categorization System")
@@ -1,6 +1,9 @@
 import os
 import re
+import errno
+import shutil
 import datetime  # Import datetime for date operations
+from concurrent.futures import ThreadPoolExecutor
 from rich.progress import Progress, TextColumn, BarColumn, TimeElapsedColumn
 
 def sanitize_filename(name, max_length=50, max_words=5):
@@ -154,50 +157,84 @@ def compute_operations(data_list, new_path, renamed_files, processed_files):
 
     return operations  # Return the list of operations for display or further processing
 
-def execute_operations(operations, dry_run=False, silent=False, log_file=None):
-    """Execute the file operations."""
+def _move_file(source, destination):
+    """Move a file with a plain rename, copying only when it crosses filesystems."""
+    try:
+        os.replace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(source, destination)
+
+def _execute_operation(operation, dry_run=False):
+    """Execute a single file operation and return its log message."""
+    source = operation['source']
+    destination = operation['destination']
+    op_type = operation.get('type', 'move')
+
+    if dry_run:
+        return f"Dry run: would {op_type} from '{source}' to '{destination}'"
+
+    try:
+        if op_type == 'move':
+            _move_file(source, destination)
+            return f"Moved '{source}' to '{destination}'"
+        elif op_type == 'hardlink':
+            os.link(source, destination)
+            return f"Created hardlink from '{source}' to '{destination}'"
+        elif op_type == 'symlink':
+            os.symlink(source, destination)
+            return f"Created symlink from '{source}' to '{destination}'"
+        else:
+            # Default to copy
+            shutil.copy2(source, destination)
+            return f"Copied '{source}' to '{destination}'"
+    except Exception as e:
+        return f"Error {op_type} from '{source}' to '{destination}': {e}"
+
+def execute_operations(operations, dry_run=False, silent=False, log_file=None, max_workers=32):
+    """Execute the file operations, running them on a pool of worker threads."""
     total_operations = len(operations)
 
+    if not dry_run:
+        # Create each destination directory once, before any worker needs it
+        for dir_path in {os.path.dirname(operation['destination']) for operation in operations}:
+            try:
+                os.makedirs(dir_path, exist_ok=True)
+            except OSError:
+                pass  # Reported by the operations that needed it
+
     with Progress(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         TimeElapsedColumn(),
         transient=True
-    ) as progress:
+    ) as progress, ThreadPoolExecutor(max_workers=max_workers) as pool:
         task = progress.add_task("Organizing Files...", total=total_operations)
-        for operation in operations:
-            source = operation['source']
-            destination = operation['destination']
-            op_type = operation.get('type', 'move')
-            dir_path = os.path.dirname(destination)
-
-            if dry_run:
-                message = f"Dry run: would {op_type} from '{source}' to '{destination}'"
-            else:
-                # Ensure the directory exists before performing the operation
-                os.makedirs(dir_path, exist_ok=True)
-
-                try:
-                    if op_type == 'move':
-                        # For move operations, we'll copy then remove the original
-                        import shutil
-                        shutil.copy2(source, destination)
-                        os.remove(source)
-                        message = f"Moved '{source}' to '{destination}'"
-                    elif op_type == 'hardlink':
-                        os.link(source, destination)
-                        message = f"Created hardlink from '{source}' to '{destination}'"
-                    elif op_type == 'symlink':
-                        os.symlink(source, destination)
-                        message = f"Created symlink from '{source}' to '{destination}'"
-                    else:
-                        # Default to copy
-                        import shutil
-                        shutil.copy2(source, destination)
-                        message = f"Copied '{source}' to '{destination}'"
-                except Exception as e:
-                    message = f"Error {op_type} from '{source}' to '{destination}': {e}"
 
+        # Operations sharing a destination run in order on one worker, so the
+        # last one still wins deterministically; the rest run in parallel
+        by_destination = {}
+        for i, operation in enumerate(operations):
+            by_destination.setdefault(operation['destination'], []).append(i)
+
+        messages = [None] * total_operations
+
+        def run_in_order(indices):
+            for i in indices:
+                messages[i] = _execute_operation(operations[i], dry_run)
+
+        # Filesystem calls block on I/O, so many can be in flight at once
+        pending = {}
+        for indices in by_destination.values():
+            future = pool.submit(run_in_order, indices)
+            for i in indices:
+                pending[i] = future
+
+        # Results are still logged in operation order
+        for i in range(total_operations):
+            pending[i].result()
+            message = messages[i]
             progress.advance(task)
 
             # Silent mode handling
@@ -206,4 +243,4 @@ def execute_operations(operations, dry_run=False, silent=False, log_file=None):
                     with open(log_file, 'a') as f:
                         f.write(message + '\n')
             else:
-                print(message)
\ No newline at end of file
+                print(message)
@@ -4,9 +4,12 @@ File Type Configuration Module
 Centralized configuration for file types, categories, and processing rules
 """
 
-from typing import Dict, List, Tuple, Optional, Callable
-from dataclasses import dataclass
+import sys
+from typing import Dict, List, Tuple, Optional, Callable, FrozenSet, Set
+from dataclasses import dataclass, replace
 from enum import Enum
+from functools import lru_cache
+from bisect import insort
 
 class FileCategory(Enum):
     """Enumeration of file categories"""
@@ -26,22 +29,33 @@ class FileCategory(Enum):
     FONTS = "Fonts"
     OTHER = "Other"
 
-@dataclass
+# Memoized module-level lookups, cleared whenever the rules change
+_LOOKUP_CACHES: List[Callable] = []
+
+@dataclass(slots=True, frozen=True)
 class FileTypeRule:
     """Configuration for a file type rule"""
-    extensions: List[str]
+    extensions: FrozenSet[str]  # Any iterable is accepted and lower-cased
     category: FileCategory
     description: str
     requires_ai_analysis: bool = False
     ai_model_type: Optional[str] = None  # 'text', 'image', or None
     custom_processor: Optional[Callable] = None
     priority: int = 0  # Higher priority rules are checked first
+    
+    def __post_init__(self):
+        # Normalize once here so lookups never need to lower-case rule extensions
+        object.__setattr__(self, 'extensions', frozenset(ext.lower() for ext in self.extensions))
 
 class FileTypeManager:
     """Centralized manager for file type configurations"""
     
     def __init__(self):
         self._rules: List[FileTypeRule] = []
+        self._ext_index: Dict[str, FileTypeRule] = {}
+        self._categories: Set[FileCategory] = set()
+        self._by_category: Optional[Dict[FileCategory, List[str]]] = None  # Built on demand
+        self._ext_table: Optional[Dict[str, Tuple[str, str, Optional[str]]]] = None  # Built on demand
         self._initialize_default_rules()
     
     def _initialize_default_rules(self):
@@ -154,54 +168,101 @@ class FileTypeManager:
             description="Font file",
             priority=70
         ))
-        
-        # Sort rules by priority (highest first)
-        self._rules.sort(key=lambda x: x.priority, reverse=True)
+    
+    def _rebuild_index(self):
+        """Rebuild the extension -> rule and category lookups from the priority-ordered rules"""
+        self._ext_index = {}
+        for rule in self._rules:
+            for ext in rule.extensions:
+                # Rules are sorted highest priority first, so the first one wins
+                self._ext_index.setdefault(ext, rule)
+        self._categories = {rule.category for rule in self._rules}
+        self._by_category = None
+        self._ext_table = None
+        self._clear_lookup_caches()
+    
+    def _clear_lookup_caches(self):
+        """Drop memoized results of the module-level lookup functions"""
+        for cached in _LOOKUP_CACHES:
+            cached.cache_clear()
     
     def add_rule(self, rule: FileTypeRule):
         """Add a new file type rule"""
-        self._rules.append(rule)
-        # Re-sort by priority
-        self._rules.sort(key=lambda x: x.priority, reverse=True)
+        # Keep rules ordered by priority (highest first); ties keep insertion order
+        insort(self._rules, rule, key=lambda x: -x.priority)
+        for ext in rule.extensions:
+            current = self._ext_index.get(ext)
+            if current is None or rule.priority > current.priority:
+                self._ext_index[ext] = rule
+        self._categories.add(rule.category)
+        self._by_category = None
+        self._ext_table = None
+        self._clear_lookup_caches()
     
     def remove_rule(self, extensions: List[str]):
         """Remove rules for specific extensions"""
+        extensions = [ext.lower() for ext in extensions]
         self._rules = [rule for rule in self._rules if not any(ext in rule.extensions for ext in extensions)]
+        self._rebuild_index()
     
     def get_rule_for_extension(self, extension: str) -> Optional[FileTypeRule]:
         """Get the rule for a specific file extension"""
-        extension = extension.lower()
-        for rule in self._rules:
-            if extension in rule.extensions:
-                return rule
-        return None
+        # Callers almost always pass lower-case extensions; only lower-case on a miss
+        rule = self._ext_index.get(extension)
+        if rule is None:
+            rule = self._ext_index.get(extension.lower())
+        return rule
+    
+    def get_extension_table(self) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """Get a flat extension -> (category name, description, AI model type or None) table"""
+        if self._ext_table is None:
+            # Interned, and one shared value tuple per rule, so every operation
+            # built from the table references the same strings
+            values = {}
+            for rule in self._rules:
+                values[rule] = (
+                    sys.intern(rule.category.value),
+                    sys.intern(rule.description),
+                    rule.ai_model_type if rule.requires_ai_analysis else None,
+                )
+            self._ext_table = {sys.intern(ext): values[rule] for ext, rule in self._ext_index.items()}
+        return self._ext_table
     
     def get_all_extensions(self) -> List[str]:
         """Get all supported file extensions"""
         extensions = []
         for rule in self._rules:
-            extensions.extend(rule.extensions)
+            extensions.extend(sorted(rule.extensions))
         return extensions
     
     def get_extensions_by_category(self, category: FileCategory) -> List[str]:
         """Get all extensions for a specific category"""
-        for rule in self._rules:
-            if rule.category == category:
-                return rule.extensions
-        return []
+        if self._by_category is None:
+            # Group every extension under the category of the rule it resolves to
+            by_category: Dict[FileCategory, List[str]] = {}
+            for ext, rule in self._ext_index.items():
+                by_category.setdefault(rule.category, []).append(ext)
+            for extensions in by_category.values():
+                extensions.sort()
+            self._by_category = by_category
+        return list(self._by_category.get(category, []))
     
     def get_categories(self) -> List[FileCategory]:
         """Get all available categories"""
-        return list(set(rule.category for rule in self._rules))
+        return list(self._categories)
     
     def update_rule(self, extensions: List[str], **kwargs):
         """Update an existing rule"""
-        for rule in self._rules:
+        extensions = [ext.lower() for ext in extensions]
+        for i, rule in enumerate(self._rules):
             if any(ext in rule.extensions for ext in extensions):
-                for key, value in kwargs.items():
-                    if hasattr(rule, key):
-                        setattr(rule, key, value)
+                # Rules are immutable, so swap in an updated copy
+                changes = {key: value for key, value in kwargs.items() if hasattr(rule, key)}
+                self._rules[i] = replace(rule, **changes)
                 break
+        # Priority or extensions may have changed
+        self._rules.sort(key=lambda x: x.priority, reverse=True)
+        self._rebuild_index()
     
     def export_config(self) -> Dict:
         """Export current configuration as dictionary"""
@@ -210,7 +271,7 @@ class FileTypeManager:
         }
         for rule in self._rules:
             rule_dict = {
-                'extensions': rule.extensions,
+                'extensions': sorted(rule.extensions),
                 'category': rule.category.value,
                 'description': rule.description,
                 'requires_ai_analysis': rule.requires_ai_analysis,
@@ -223,6 +284,7 @@ class FileTypeManager:
     def import_config(self, config: Dict):
         """Import configuration from dictionary"""
         self._rules.clear()
+        self._rebuild_index()
         for rule_dict in config.get('rules', []):
             rule = FileTypeRule(
                 extensions=rule_dict['extensions'],
@@ -238,22 +300,28 @@ class FileTypeManager:
 file_type_manager = FileTypeManager()
 
 # Convenience functions for backward compatibility
+@lru_cache(maxsize=512)
 def get_file_category(extension: str) -> str:
     """Get category for a file extension (backward compatibility)"""
     rule = file_type_manager.get_rule_for_extension(extension)
     return rule.category.value if rule else FileCategory.OTHER.value
 
+@lru_cache(maxsize=512)
 def get_file_description(extension: str) -> str:
     """Get description for a file extension (backward compatibility)"""
     rule = file_type_manager.get_rule_for_extension(extension)
     return rule.description if rule else "Other file"
 
+@lru_cache(maxsize=512)
 def is_ai_analysis_required(extension: str) -> bool:
     """Check if AI analysis is required for a file extension"""
     rule = file_type_manager.get_rule_for_extension(extension)
     return rule.requires_ai_analysis if rule else False
 
+@lru_cache(maxsize=512)
 def get_ai_model_type(extension: str) -> Optional[str]:
     """Get AI model type for a file extension"""
     rule = file_type_manager.get_rule_for_extension(extension)
     return rule.ai_model_type if rule else None
+
+_LOOKUP_CACHES.extend([get_file_category, get_file_description, is_ai_analysis_required, get_ai_model_type])
@@ -1,6 +1,7 @@
 import os
 import re
 import shutil
+from collections import namedtuple
 from PIL import Image
 import pytesseract
 import fitz  # PyMuPDF
@@ -105,32 +106,77 @@ def display_directory_tree(path):
     else:
         print(os.path.abspath(path))
 
-def collect_file_paths(base_path, recursive=True):
-    """Collect all file paths from the base directory or single file, excluding hidden files."""
+# A collected file, with the name, lower-cased extension and stat info gathered during the scan
+FileEntry = namedtuple('FileEntry', ['path', 'name', 'ext', 'size', 'mtime'])
+
+def _make_file_entry(path, name, entry=None):
+    """Build a FileEntry, taking stat info from the DirEntry when one is available."""
+    stem, dot, suffix = name.rpartition('.')
+    ext = (dot + suffix).lower() if stem else ''
+    try:
+        stat = entry.stat() if entry is not None else os.stat(path)
+        return FileEntry(path, name, ext, stat.st_size, stat.st_mtime)
+    except OSError:
+        return FileEntry(path, name, ext, 0, None)
+
+def iter_file_entries(base_path, recursive=True, ignored_folders=None):
+    """Yield FileEntry records from the base directory or single file as they are found, excluding hidden files.
+    
+    Folders skipped by a non-recursive scan are appended to ignored_folders when a list is given.
+    """
     if os.path.isfile(base_path):
-        return [base_path], []
+        yield _make_file_entry(base_path, os.path.basename(base_path))
+        return
+    
+    if recursive:
+        # Recursive search: scan all subdirectories, in the same top-down order as os.walk
+        pending_dirs = [base_path]
+        while pending_dirs:
+            dir_path = pending_dirs.pop()
+            subdirs = []
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            # Like os.walk, don't descend into symlinked directories
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif not entry.name.startswith('.'):  # Exclude hidden files
+                            yield _make_file_entry(entry.path, entry.name, entry)
+            except OSError:
+                continue
+            pending_dirs.extend(reversed(subdirs))
     else:
-        file_paths = []
-        ignored_folders = []
-        
-        if recursive:
-            # Recursive search: scan all subdirectories
-            for root, _, files in os.walk(base_path):
-                for file in files:
-                    if not file.startswith('.'):  # Exclude hidden files
-                        file_paths.append(os.path.join(root, file))
-        else:
-            # Simple search: only scan the root directory
-            for item in os.listdir(base_path):
-                if not item.startswith('.'):  # Exclude hidden files
-                    item_path = os.path.join(base_path, item)
-                    if os.path.isfile(item_path):
-                        file_paths.append(item_path)
-                    elif os.path.isdir(item_path):
+        # Simple search: only scan the root directory
+        with os.scandir(base_path) as entries:
+            for entry in entries:
+                if not entry.name.startswith('.'):  # Exclude hidden files
+                    if entry.is_file():
+                        yield _make_file_entry(entry.path, entry.name, entry)
+                    elif entry.is_dir() and ignored_folders is not None:
                         # Collect ignored folders for later inclusion
-                        ignored_folders.append(item_path)
-        
-        return file_paths, ignored_folders
+                        ignored_folders.append(entry.path)
+
+def iter_file_paths(base_path, recursive=True, ignored_folders=None):
+    """Yield file paths from the base directory or single file as they are found, excluding hidden files."""
+    for entry in iter_file_entries(base_path, recursive=recursive, ignored_folders=ignored_folders):
+        yield entry.path
+
+def collect_file_entries(base_path, recursive=True):
+    """Collect FileEntry records from the base directory or single file, excluding hidden files."""
+    ignored_folders = []
+    file_entries = list(iter_file_entries(base_path, recursive=recursive, ignored_folders=ignored_folders))
+    return file_entries, ignored_folders
+
+def collect_file_paths(base_path, recursive=True):
+    """Collect all file paths from the base directory or single file, excluding hidden files."""
+    ignored_folders = []
+    file_paths = list(iter_file_paths(base_path, recursive=recursive, ignored_folders=ignored_folders))
+    return file_paths, ignored_folders
 
 def separate_files_by_type(file_paths):
     """Separate files into images and text files based on their extensions."""
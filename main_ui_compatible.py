@@ -8,34 +8,37 @@ import sys
 import json
 import argparse
 import platform
+import functools
+import itertools
+import weakref
+import importlib.util
+import contextlib
 from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 
-# Optional torch import for AI functionality
-try:
-    import torch
-    TORCH_AVAILABLE = True
-except ImportError:
-    TORCH_AVAILABLE = False
+# Optional torch for AI functionality. Like transformers below, it is only
+# looked up here and imported where it is used, so date and type modes skip it
+TORCH_AVAILABLE = importlib.util.find_spec('torch') is not None
+
+# Optional transformers for AI functionality. It is only looked up here and
+# imported by the model loaders, so date and type modes never pay for it
+TRANSFORMERS_AVAILABLE = importlib.util.find_spec('transformers') is not None
 
-# Optional transformers import for AI functionality
+# Optional orjson import for faster JSON output
 try:
-    from transformers import (
-        AutoTokenizer, 
-        AutoModelForCausalLM,
-        AutoProcessor,
-        AutoModelForImageTextToText
-    )
-    TRANSFORMERS_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TRANSFORMERS_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from file_utils import (
     display_directory_tree,
-    collect_file_paths,
+    iter_file_entries,
     separate_files_by_type,
     read_file_data
 )
@@ -48,7 +51,7 @@ from data_processing_common import (
 )
 
 from file_type_config import file_type_manager, FileCategory
-from content_based_categorization import categorize_by_content
+from content_based_categorization import categorize_by_content_batch
 
 def detect_operating_system():
     """Detect the current operating system."""
@@ -72,7 +75,142 @@ def ensure_nltk_data():
     except ImportError:
         pass  # NLTK not available
 
-def initialize_models():
+def get_quantization_kwargs(quantize):
+    """Build from_pretrained kwargs that load model weights in 8-bit, when supported."""
+    if not quantize:
+        return {}
+    
+    if not TORCH_AVAILABLE:
+        print("8-bit quantization requires a CUDA GPU - loading full-precision text model")
+        return {}
+    
+    import torch
+    if not torch.cuda.is_available():
+        print("8-bit quantization requires a CUDA GPU - loading full-precision text model")
+        return {}
+    
+    try:
+        import bitsandbytes  # noqa: F401
+        from transformers import BitsAndBytesConfig
+    except ImportError:
+        print("bitsandbytes not installed - loading full-precision text model")
+        return {}
+    
+    return {
+        'quantization_config': BitsAndBytesConfig(load_in_8bit=True),
+        'device_map': 'auto'
+    }
+
+def get_inference_device():
+    """Pick the device used for model inference."""
+    if not TORCH_AVAILABLE:
+        return 'cpu'
+    
+    import torch
+    return 'cuda' if torch.cuda.is_available() else 'cpu'
+
+def get_half_precision_dtype():
+    """Pick the reduced-precision dtype supported by the GPU."""
+    import torch
+    return torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+
+def prepare_model_for_inference(model):
+    """Move a model to the inference device, in half precision on GPU."""
+    if model is None or not TORCH_AVAILABLE:
+        return model
+    
+    # Models placed with device_map (e.g. 8-bit quantized) must not be moved
+    if getattr(model, 'hf_device_map', None) is not None:
+        return model
+    
+    if get_inference_device() == 'cuda':
+        return model.to(device='cuda', dtype=get_half_precision_dtype())
+    return model
+
+@contextlib.contextmanager
+def inference_context(model):
+    """Run generate calls in inference mode, with half-precision autocast on GPU."""
+    import torch
+    with torch.inference_mode():
+        if model.device.type == 'cuda':
+            with torch.autocast(device_type='cuda', dtype=get_half_precision_dtype()):
+                yield
+        else:
+            yield
+
+# Text models whose forward pass was compiled for fixed-shape description batches
+_COMPILED_TEXT_MODELS = weakref.WeakSet()
+
+def compile_text_model(text_model, text_tokenizer, warmup_runs=2, batch_size=16):
+    """Compile the text model's forward pass once and warm it up so later generate calls replay it."""
+    if TORCH_AVAILABLE:
+        import torch
+    if not TORCH_AVAILABLE or not hasattr(torch, 'compile'):
+        print("torch.compile not available - using the eager text model")
+        return text_model
+    
+    original_forward = text_model.forward
+    try:
+        text_model.forward = torch.compile(original_forward, mode="reduce-overhead", fullgraph=False)
+        
+        # The first calls trigger compilation; pay that cost before processing
+        # files, using the exact shape text descriptions are generated with
+        if text_tokenizer.pad_token is None:
+            text_tokenizer.pad_token = text_tokenizer.eos_token
+        text_tokenizer.padding_side = 'left'
+        warmup_inputs = text_tokenizer(
+            ["Warm up"] * batch_size,
+            return_tensors="pt",
+            padding='max_length',
+            max_length=TEXT_INPUT_MAX_TOKENS
+        ).to(text_model.device)
+        with inference_context(text_model):
+            for _ in range(warmup_runs):
+                text_model.generate(
+                    **warmup_inputs,
+                    max_new_tokens=TEXT_DESCRIPTION_MAX_NEW_TOKENS,
+                    do_sample=False,
+                    pad_token_id=text_tokenizer.pad_token_id,
+                    cache_implementation="static"
+                )
+        _COMPILED_TEXT_MODELS.add(text_model)
+        print("✅ Text model compiled successfully!")
+    except Exception as e:
+        print(f"❌ Error compiling text model: {e}")
+        text_model.forward = original_forward
+    
+    return text_model
+
+def _from_pretrained(model_class, model_name, **kwargs):
+    """Load from the local Hugging Face cache, only going to the network when it's missing."""
+    try:
+        return model_class.from_pretrained(model_name, local_files_only=True, **kwargs)
+    except Exception:
+        return model_class.from_pretrained(model_name, **kwargs)
+
+@functools.cache
+def _load_text_model(model_name, quantize=False, compile_text=False):
+    """Load the text tokenizer and model once per process."""
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    
+    text_tokenizer = _from_pretrained(AutoTokenizer, model_name)
+    text_model = prepare_model_for_inference(
+        _from_pretrained(AutoModelForCausalLM, model_name, **get_quantization_kwargs(quantize))
+    )
+    if compile_text:
+        text_model = compile_text_model(text_model, text_tokenizer)
+    return text_tokenizer, text_model
+
+@functools.cache
+def _load_image_model(model_name):
+    """Load the image processor and model once per process."""
+    from transformers import AutoProcessor, AutoModelForImageTextToText
+    
+    image_processor = _from_pretrained(AutoProcessor, model_name, use_fast=True)
+    image_model = prepare_model_for_inference(_from_pretrained(AutoModelForImageTextToText, model_name))
+    return image_processor, image_model
+
+def initialize_models(quantize_text_model=False, compile_text=False):
     """Initialize the AI models using Hugging Face Transformers."""
     if not TRANSFORMERS_AVAILABLE:
         print("Transformers not available - AI models cannot be loaded")
@@ -87,9 +225,9 @@ def initialize_models():
         
         print("Loading text model...")
         try:
-            model_name = "microsoft/DialoGPT-medium"
-            text_tokenizer = AutoTokenizer.from_pretrained(model_name)
-            text_model = AutoModelForCausalLM.from_pretrained(model_name)
+            text_tokenizer, text_model = _load_text_model(
+                "microsoft/DialoGPT-medium", quantize_text_model, compile_text
+            )
             print("✅ Text model loaded successfully!")
         except Exception as e:
             print(f"❌ Error loading text model: {e}")
@@ -97,9 +235,7 @@ def initialize_models():
         
         print("Loading image model...")
         try:
-            model_name = "Salesforce/blip-image-captioning-base"
-            image_processor = AutoProcessor.from_pretrained(model_name, use_fast=True)
-            image_model = AutoModelForImageTextToText.from_pretrained(model_name)
+            image_processor, image_model = _load_image_model("Salesforce/blip-image-captioning-base")
             print("✅ Image model loaded successfully!")
         except Exception as e:
             print(f"❌ Error loading image model: {e}")
@@ -110,172 +246,366 @@ def initialize_models():
         print("AI models not available - using basic processing")
         return None, None, None, None
 
-def analyze_text_with_ai(text_content, text_model, text_tokenizer, max_length=100):
-    """Analyze text content using AI to generate a description."""
+# Category, description and AI model type for extensions without a rule
+OTHER_FILE_TYPE = ('Other', 'Other file', None)
+
+# Only the start of a text file is used for descriptions and categorization
+TEXT_READ_BYTES = 4096
+
+# Prompt length for text descriptions, roughly the first 500 characters
+TEXT_INPUT_MAX_TOKENS = 128
+TEXT_DESCRIPTION_MAX_NEW_TOKENS = 50
+
+def peek_files_needing_ai(file_entries):
+    """Check whether any file needs AI analysis, reading ahead only as far as the first one.
+    
+    Returns the answer and an iterator over all the entries, including those read ahead.
+    """
+    ext_table = file_type_manager.get_extension_table()
+    file_entries = iter(file_entries)
+    read_ahead = []
+    for entry in file_entries:
+        read_ahead.append(entry)
+        if ext_table.get(entry.ext, OTHER_FILE_TYPE)[2] is not None:
+            return True, itertools.chain(read_ahead, file_entries)
+    return False, iter(read_ahead)
+
+def _describe_text_without_ai(text_content, word_count=20, suffix=''):
+    """Build a plain description from the first words of a text."""
+    words = text_content.split()[:word_count]
+    return f"Document containing: {' '.join(words)}{suffix}"
+
+def _generate_text_descriptions(texts, text_model, text_tokenizer, max_new_tokens):
+    """Generate descriptions for one batch of texts, raising if the batch fails."""
+    # A compiled model replays its warm-up graphs only if every call has the same
+    # shape: inputs padded to the full length, a static key/value cache (the default
+    # one grows every token) and the warm-up's generation length. The static cache is
+    # passed per call so categorization prompts, which vary in length, don't use it.
+    compiled = text_model in _COMPILED_TEXT_MODELS
+    static_kwargs = {}
+    if compiled:
+        max_new_tokens = TEXT_DESCRIPTION_MAX_NEW_TOKENS
+        static_kwargs['cache_implementation'] = "static"
+    
+    inputs = text_tokenizer(
+        texts,
+        return_tensors="pt",
+        padding='max_length' if compiled else True,
+        truncation=True,
+        max_length=TEXT_INPUT_MAX_TOKENS
+    ).to(text_model.device, non_blocking=True)
+    
+    with inference_context(text_model):
+        outputs = text_model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            num_return_sequences=1,
+            do_sample=False,  # Greedy: deterministic descriptions, no sampling overhead
+            num_beams=1,
+            use_cache=True,
+            pad_token_id=text_tokenizer.pad_token_id,
+            **static_kwargs
+        )
+    
+    # Decode only the generated tokens; the prompt is the file's own text
+    descriptions = []
+    generated = outputs[:, inputs['input_ids'].shape[1]:]
+    for text, response in zip(texts, text_tokenizer.batch_decode(generated, skip_special_tokens=True)):
+        print(f'text_model response: {response}')
+        descriptions.append(response.strip() or _describe_text_without_ai(text))
+    return descriptions
+
+def analyze_texts_with_ai(text_contents, text_model, text_tokenizer, max_new_tokens=TEXT_DESCRIPTION_MAX_NEW_TOKENS, batch_size=16):
+    """Analyze several text contents using AI, generating descriptions in batches."""
     if text_model is None or text_tokenizer is None:
-        words = text_content.split()[:20]
-        return f"Document containing: {' '.join(words)}"
+        return [_describe_text_without_ai(text_content) for text_content in text_contents]
     
     if not TORCH_AVAILABLE:
-        words = text_content.split()[:20]
-        return f"Document containing: {' '.join(words)} (AI analysis unavailable - torch not installed)"
+        return [
+            _describe_text_without_ai(text_content, suffix=' (AI analysis unavailable - torch not installed)')
+            for text_content in text_contents
+        ]
     
-    try:
-        inputs = text_tokenizer.encode(text_content[:500], return_tensors="pt", truncation=True)
-        
-        with torch.no_grad():
-            outputs = text_model.generate(
-                inputs, 
-                max_length=min(max_length, len(inputs[0]) + 50),
-                num_return_sequences=1,
-                temperature=0.7,
-                do_sample=True,
-                pad_token_id=text_tokenizer.eos_token_id
-            )
+    # Decoder-only models must be padded on the left for batched generation
+    if text_tokenizer.pad_token is None:
+        text_tokenizer.pad_token = text_tokenizer.eos_token
+    text_tokenizer.padding_side = 'left'
+    
+    descriptions = []
+    for start in range(0, len(text_contents), batch_size):
+        batch = text_contents[start:start + batch_size]
+        if len(batch) > 1:
+            try:
+                descriptions.extend(_generate_text_descriptions(batch, text_model, text_tokenizer, max_new_tokens))
+                continue
+            except Exception as e:
+                print(f"Batched text analysis failed, retrying file by file: {e}", file=sys.stderr)
         
-        response = text_tokenizer.decode(outputs[0], skip_special_tokens=True)
-        print(f'text_model response: {response}')
-        return response.strip()
-    except Exception as e:
-        words = text_content.split()[:15]
-        return f"Document: {' '.join(words)}"
+        # One file at a time, so a single bad file only loses its own description
+        for text_content in batch:
+            try:
+                descriptions.extend(_generate_text_descriptions([text_content], text_model, text_tokenizer, max_new_tokens))
+            except Exception as e:
+                print(f"Text analysis failed: {e}", file=sys.stderr)
+                descriptions.append(f"Document: {' '.join(text_content.split()[:15])}")
+    
+    return descriptions
 
-def analyze_image_with_ai(image_path, image_model, image_processor, max_length=50):
-    """Analyze image content using AI to generate a description."""
+def analyze_text_with_ai(text_content, text_model, text_tokenizer, max_new_tokens=TEXT_DESCRIPTION_MAX_NEW_TOKENS):
+    """Analyze text content using AI to generate a description."""
+    return analyze_texts_with_ai([text_content], text_model, text_tokenizer, max_new_tokens)[0]
+
+def _read_text_content(file_path):
+    """Read the head of a text file for AI analysis."""
+    with open(file_path, 'rb') as file:
+        raw = file.read(TEXT_READ_BYTES)
+    return raw.decode('utf-8', errors='replace')
+
+def _get_image_input_size(image_processor, default=(384, 384)):
+    """Get the (width, height) the image processor resizes images to."""
+    size = getattr(getattr(image_processor, 'image_processor', image_processor), 'size', None)
+    if isinstance(size, dict) and 'width' in size and 'height' in size:
+        return size['width'], size['height']
+    return default
+
+def _load_image(image_path, size=(384, 384)):
+    """Open and decode an image for captioning, as RGB at the model input size."""
+    with Image.open(image_path) as image:
+        # Let JPEG decode at a reduced DCT scale; a no-op for other formats
+        image.draft('RGB', size)
+        return image.convert('RGB').resize(size, Image.BILINEAR)
+
+def analyze_images_with_ai(image_paths, image_model, image_processor, max_length=30, batch_size=16):
+    """Analyze several images using AI, generating captions in batches."""
     if image_model is None or image_processor is None:
-        return "Image file"
+        return ["Image file"] * len(image_paths)
     
     if not TORCH_AVAILABLE:
-        return "Image file (AI analysis unavailable - torch not installed)"
+        return ["Image file (AI analysis unavailable - torch not installed)"] * len(image_paths)
     
-    try:
-        from PIL import Image
-        image = Image.open(image_path)
-        inputs = image_processor(image, return_tensors="pt")
-        
-        with torch.no_grad():
-            outputs = image_model.generate(
-                **inputs,
-                max_length=max_length,
-                num_return_sequences=1,
-                temperature=0.7,
-                do_sample=True
-            )
+    captions = ["Image file"] * len(image_paths)
+    batches = [range(start, min(start + batch_size, len(image_paths)))
+               for start in range(0, len(image_paths), batch_size)]
+    if not batches:
+        return captions
+    
+    # Images are decoded straight to the model input size, so the processor
+    # only has to rescale and normalize them
+    size = _get_image_input_size(image_processor)
+    
+    # Decode images on worker threads, one batch ahead of the model
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as io_pool:
+        next_loads = [io_pool.submit(_load_image, image_paths[i], size) for i in batches[0]]
         
-        caption = image_processor.decode(outputs[0], skip_special_tokens=True)
-        print(f'image_model response: {caption}')
-        return caption.strip()
-    except Exception as e:
-        return "Image file"
+        for k, batch in enumerate(batches):
+            loads = next_loads
+            if k + 1 < len(batches):
+                next_loads = [io_pool.submit(_load_image, image_paths[i], size) for i in batches[k + 1]]
+            
+            # Images that fail to open keep the default caption
+            indices = []
+            images = []
+            for i, load in zip(batch, loads):
+                try:
+                    images.append(load.result())
+                    indices.append(i)
+                except Exception:
+                    pass
+            
+            if not images:
+                continue
+            
+            try:
+                inputs = image_processor(images=images, return_tensors="pt", do_resize=False).to(
+                    device=image_model.device, dtype=image_model.dtype, non_blocking=True
+                )
+            
+                with inference_context(image_model):
+                    outputs = image_model.generate(
+                        **inputs,
+                        max_length=max_length,
+                        num_return_sequences=1,
+                        do_sample=False,
+                        num_beams=1,
+                        use_cache=True
+                    )
+            
+                for i, caption in zip(indices, image_processor.batch_decode(outputs, skip_special_tokens=True)):
+                    print(f'image_model response: {caption}')
+                    captions[i] = caption.strip()
+            except Exception as e:
+                # Keep the default captions for this batch
+                print(f"Batched image analysis failed: {e}", file=sys.stderr)
+    
+    return captions
+
+def analyze_image_with_ai(image_path, image_model, image_processor, max_length=30):
+    """Analyze image content using AI to generate a description."""
+    return analyze_images_with_ai([image_path], image_model, image_processor, max_length)[0]
 
-def process_files_with_ai(file_paths, output_path, text_model, text_tokenizer, image_model, image_processor, silent=False):
+def process_files_with_ai(file_entries, output_path, text_model, text_tokenizer, image_model, image_processor, silent=False, batch_size=16, cache_results=False):
     """Process files using AI analysis."""
     operations = []
     
-    for file_path in file_paths:
-        try:
-            file_name = os.path.basename(file_path)
-            file_ext = os.path.splitext(file_name)[1].lower()
+    # Files needing AI analysis, as (operation index, ...) so results can be
+    # scattered back once the batched inference is done
+    text_reads = []
+    text_jobs = []
+    image_jobs = []
+    
+    # One dict lookup per file instead of consulting the rule objects
+    ext_table = file_type_manager.get_extension_table()
+    dest_dirs = {}
+    
+    # Text files are read on worker threads while classification continues
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as io_pool:
+        # Pass 1: extension-based classification, collecting the AI work
+        for entry in file_entries:
+            file_path = entry.path
+            try:
+                file_name = entry.name
+                file_ext = entry.ext
             
-            # Get file type rule from the manager
-            rule = file_type_manager.get_rule_for_extension(file_ext)
+                # Extension-based category and description, plus the AI analysis it needs
+                category, description, ai_model_type = ext_table.get(file_ext, OTHER_FILE_TYPE)
             
-            if rule:
-                # Start with extension-based category and description
-                extension_category = rule.category.value
-                description = rule.description
-                
-                # Handle AI analysis and content-based categorization
-                if rule.requires_ai_analysis:
-                    if rule.ai_model_type == 'text':
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as file:
-                                content = file.read()
-                            
-                            # Get AI description
-                            ai_description = analyze_text_with_ai(content, text_model, text_tokenizer)
-                            
-                            # Use AI-powered content-based categorization
-                            category, enhanced_description, tags, confidence = categorize_by_content(
-                                file_path, content, ai_description, extension_category, text_model, text_tokenizer
-                            )
-                            
-                            # Update description with content analysis and tags
-                            description = enhanced_description
-                            if tags:
-                                description += f" | Tags: {', '.join(tags)}"
-                            
-                        except Exception as e:
-                            # Fallback to extension-based categorization
-                            category = extension_category
-                            description = f"{rule.description} (AI analysis failed: {str(e)})"
-                    
-                    elif rule.ai_model_type == 'image':
-                        description = analyze_image_with_ai(file_path, image_model, image_processor)
-                        category = extension_category  # Images still use extension-based for now
-                    
-                    else:
-                        category = extension_category
-                        description = rule.description
-                else:
-                    # No AI analysis required, use extension-based
-                    category = extension_category
-                    description = rule.description
-            else:
-                # Default fallback for unknown extensions
-                description = "Other file"
-                category = 'Other'
+                # Queue AI analysis and content-based categorization
+                if ai_model_type == 'text':
+                    text_reads.append((len(operations), file_path, io_pool.submit(_read_text_content, file_path), category))
             
-            # Create destination path
-            dest_dir = os.path.join(output_path, category)
-            dest_path = os.path.join(dest_dir, file_name)
+                elif ai_model_type == 'image':
+                    # Images still use extension-based category for now
+                    image_jobs.append((len(operations), file_path))
             
-            operations.append({
-                'source': file_path,
-                'destination': dest_path,
-                'type': 'move',
-                'description': description,
-                'category': category
-            })
+                # Create destination path, joining each category folder only once
+                dest_dir = dest_dirs.get(category)
+                if dest_dir is None:
+                    dest_dir = dest_dirs[category] = os.path.join(output_path, category)
+                dest_path = os.path.join(dest_dir, file_name)
             
+                operations.append({
+                    'source': file_path,
+                    'destination': dest_path,
+                    'type': 'move',
+                    'description': description,
+                    'category': category
+                })
+            
+            except Exception as e:
+                if not silent:
+                    print(f"Error processing {file_path}: {e}")
+        
+        for index, file_path, pending_read, category in text_reads:
+            try:
+                text_jobs.append((index, file_path, pending_read.result(), category))
+            except Exception as e:
+                # Fallback to extension-based categorization
+                operations[index]['description'] += f" (AI analysis failed: {str(e)})"
+    
+    # Pass 2: batched inference, results written back into the operations
+    if text_jobs:
+        try:
+            ai_descriptions = analyze_texts_with_ai(
+                [content for _, _, content, _ in text_jobs], text_model, text_tokenizer, batch_size=batch_size
+            )
+            
+            # Use AI-powered content-based categorization
+            results = categorize_by_content_batch(
+                [(file_path, content, ai_description, extension_category)
+                 for (_, file_path, content, extension_category), ai_description in zip(text_jobs, ai_descriptions)],
+                text_model, text_tokenizer, batch_size, use_cache=cache_results
+            )
+            
+            for (index, file_path, _, _), (category, enhanced_description, tags, confidence) in zip(text_jobs, results):
+                # Update description with content analysis and tags
+                description = enhanced_description
+                if tags:
+                    description += f" | Tags: {', '.join(tags)}"
+                
+                operation = operations[index]
+                operation['category'] = category
+                operation['description'] = description
+                operation['destination'] = os.path.join(output_path, category, os.path.basename(file_path))
         except Exception as e:
-            if not silent:
-                print(f"Error processing {file_path}: {e}")
+            # Fallback to extension-based categorization
+            for index, _, _, _ in text_jobs:
+                operations[index]['description'] += f" (AI analysis failed: {str(e)})"
+    
+    if image_jobs:
+        captions = analyze_images_with_ai(
+            [file_path for _, file_path in image_jobs], image_model, image_processor, batch_size=batch_size
+        )
+        for (index, _), caption in zip(image_jobs, captions):
+            operations[index]['description'] = caption
     
     return operations
 
-def simulate_directory_tree(operations, output_path, ignored_folders=None):
-    """Simulate the directory tree that would be created."""
-    tree = {}
+def iter_files_with_ai(file_entries, output_path, text_model, text_tokenizer, image_model, image_processor, silent=False, batch_size=16, chunk_size=1024, cache_results=False):
+    """Process files using AI analysis, yielding operations one chunk of files at a time.
+    
+    Only chunk_size files and their operations are held at once, so large
+    directories can be streamed straight from the scan into the tree.
+    """
+    file_entries = iter(file_entries)
+    while True:
+        chunk = list(itertools.islice(file_entries, chunk_size))
+        if not chunk:
+            return
+        yield from process_files_with_ai(
+            chunk, output_path, text_model, text_tokenizer, image_model, image_processor, silent, batch_size, cache_results
+        )
+
+def simulate_directory_tree(operations, output_path, ignored_folders=None, file_stats=None):
+    """Simulate the directory tree that would be created.
+    
+    file_stats optionally maps source paths to (size, mtime) gathered while
+    collecting files, saving a second stat per file.
+    """
+    # Files are bucketed per directory in the order they were collected; only
+    # print_simulated_tree sorts, the JSON preview keeps this order
+    tree = defaultdict(list)
+    
+    # Destinations are built under output_path, so strip that prefix directly
+    # rather than calling os.path.relpath for every file
+    output_prefix = os.path.join(output_path, '')
+    prefix_len = len(output_prefix)
     
+    # Operations may be streamed, so they are consumed in a single pass
     for op in operations:
         op_type = op.get('type', 'move')
         
         if op_type in ['move', 'hardlink', 'symlink']:
             dest_path = op['destination']
             source_path = op['source']
-            rel_path = os.path.relpath(dest_path, output_path)
-            dir_path = os.path.dirname(rel_path)
-            
-            if dir_path not in tree:
-                tree[dir_path] = []
+            if dest_path.startswith(output_prefix):
+                rel_path = dest_path[prefix_len:]
+            else:
+                rel_path = os.path.relpath(dest_path, output_path)
+            dir_path, _, file_name = rel_path.rpartition(os.sep)
             
             # Include file info with size
             file_info = {
-                'name': os.path.basename(dest_path),
+                'name': file_name,
                 'source': source_path
             }
             
-            # Get file size from original file
-            try:
-                if os.path.exists(source_path):
-                    file_info['size'] = os.path.getsize(source_path)
-                    file_info['modified'] = os.path.getmtime(source_path)
-                else:
+            stats = file_stats.get(source_path) if file_stats is not None else None
+            if stats is not None:
+                # Use the size and modification time collected with the path
+                file_info['size'], modified = stats
+                if modified is not None:
+                    file_info['modified'] = modified
+            else:
+                # Get file size from original file
+                try:
+                    if os.path.exists(source_path):
+                        file_info['size'] = os.path.getsize(source_path)
+                        file_info['modified'] = os.path.getmtime(source_path)
+                    else:
+                        file_info['size'] = 0
+                except OSError:
                     file_info['size'] = 0
-            except OSError:
-                file_info['size'] = 0
-                
+            
             tree[dir_path].append(file_info)
     
     # Add ignored folders to the tree
@@ -291,12 +621,24 @@ def simulate_directory_tree(operations, output_path, ignored_folders=None):
             }
             
             # Add to root level
-            if '.' not in tree:
-                tree['.'] = []
             tree['.'].append(ignored_folder_info)
     
     return tree
 
+def write_json_output(result):
+    """Write the result as a single JSON line on stdout for the UI."""
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE)
+        # The UI decodes stdout chunk by chunk, so keep the stdlib's ASCII-only
+        # output: fall back when a name would be written as raw UTF-8
+        if data.isascii():
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
+    
+    print(json.dumps(result), flush=True)
+
 def print_simulated_tree(tree):
     """Print the simulated directory tree."""
     for directory, files in sorted(tree.items()):
@@ -322,6 +664,9 @@ def main():
     parser.add_argument('--dry-run', type=str, default='true', help='Dry run mode (true/false)')
     parser.add_argument('--json-output', action='store_true', help='Output results as JSON')
     parser.add_argument('--recursive', type=str, default='true', help='Recursive search (true/false)')
+    parser.add_argument('--quantize', type=str, default='false', help='Load the text model with 8-bit weights (true/false)')
+    parser.add_argument('--compile', type=str, default='false', help='Compile the text model with torch.compile (true/false)')
+    parser.add_argument('--cache-results', type=str, default='false', help='Cache AI categorization results on disk between runs (true/false)')
     
     args = parser.parse_args()
     
@@ -338,20 +683,41 @@ def main():
     
     # Collect file paths with recursive option
     recursive = args.recursive.lower() == 'true'
-    file_paths, ignored_folders = collect_file_paths(args.input, recursive=recursive)
+    quantize = args.quantize.lower() == 'true'
+    compile_text = args.compile.lower() == 'true'
+    cache_results = args.cache_results.lower() == 'true'
+    
+    # Files are streamed from the scan straight into processing; stats are
+    # recorded on the way through for the tree preview
+    ignored_folders = []
+    file_stats = {}
+    
+    def stream_file_entries():
+        for entry in iter_file_entries(args.input, recursive=recursive, ignored_folders=ignored_folders):
+            file_stats[entry.path] = (entry.size, entry.mtime)
+            yield entry
+    
+    file_entries = stream_file_entries()
+    file_paths = (entry.path for entry in file_entries)
     
     if args.json_output:
         # Generate structure preview
         if args.mode == 'ai_content':
-            text_model, image_model, text_tokenizer, image_processor = initialize_models()
-            operations = process_files_with_ai(file_paths, args.output, text_model, text_tokenizer, image_model, image_processor, silent=True)
+            # Model loading is skipped when every file is classified by extension alone
+            needs_ai, file_entries = peek_files_needing_ai(file_entries)
+            if needs_ai:
+                text_model, image_model, text_tokenizer, image_processor = initialize_models(quantize_text_model=quantize, compile_text=compile_text)
+            else:
+                text_model, image_model, text_tokenizer, image_processor = None, None, None, None
+            # Only the tree is needed here, so operations are streamed into it
+            operations = iter_files_with_ai(file_entries, args.output, text_model, text_tokenizer, image_model, image_processor, silent=True, cache_results=cache_results)
         elif args.mode == 'date':
             operations = process_files_by_date(file_paths, args.output, dry_run=True, silent=True)
         elif args.mode == 'type':
             operations = process_files_by_type(file_paths, args.output, dry_run=True, silent=True)
         
         # Create tree structure for UI
-        tree = simulate_directory_tree(operations, args.output, ignored_folders)
+        tree = simulate_directory_tree(operations, args.output, ignored_folders, file_stats)
         
         # Detect operating system
         detected_os = detect_operating_system()
@@ -429,18 +795,26 @@ def main():
             'message': f'Structure preview generated for {args.mode} mode'
         }
         
-        print(json.dumps(result))
+        write_json_output(result)
         return
     
     # Regular execution mode
     dry_run = args.dry_run.lower() == 'true'
     
     if args.mode == 'ai_content':
-        print("Initializing AI models...")
-        text_model, image_model, text_tokenizer, image_processor = initialize_models()
+        # Model loading is skipped when every file is classified by extension alone
+        needs_ai, file_entries = peek_files_needing_ai(file_entries)
+        if needs_ai:
+            print("Initializing AI models...")
+            text_model, image_model, text_tokenizer, image_processor = initialize_models(quantize_text_model=quantize, compile_text=compile_text)
+        else:
+            print("No files need AI analysis - skipping model initialization")
+            text_model, image_model, text_tokenizer, image_processor = None, None, None, None
         
         print("Processing files with AI...")
-        operations = process_files_with_ai(file_paths, args.output, text_model, text_tokenizer, image_model, image_processor)
+        # Files are read and analyzed a chunk at a time; the operations are kept
+        # since they are both printed and executed
+        operations = list(iter_files_with_ai(file_entries, args.output, text_model, text_tokenizer, image_model, image_processor, cache_results=cache_results))
         
     elif args.mode == 'date':
         print("Processing files by date...")
@@ -452,7 +826,7 @@ def main():
     
     # Show proposed structure
     print("Proposed directory structure:")
-    tree = simulate_directory_tree(operations, args.output)
+    tree = simulate_directory_tree(operations, args.output, file_stats=file_stats)
     print_simulated_tree(tree)
     
     if not dry_run: